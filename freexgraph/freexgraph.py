@@ -21,8 +21,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import sys
+
+from collections import defaultdict, deque
 from copy import copy, deepcopy
-from typing import Optional, Union, Set, List, Any, Tuple
+from typing import (
+    Optional,
+    Union,
+    Set,
+    List,
+    Any,
+    Tuple,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+)
 
 import networkx as nx
 
@@ -33,11 +47,54 @@ root_node = "::root_node::"
 AnyVisitor = Any
 """Any visitor is a class that is inheriting from AbstractVisitor"""
 
+_topological_order_key = "topological_order"
+_reversed_topological_order_key = "reversed_topological_order"
+
+
+def _intern_id(node_id: str) -> str:
+    """Intern the provided id, str subclasses (as str Enum) cannot be interned and are returned as is"""
+    if type(node_id) is str:
+        return sys.intern(node_id)
+    return node_id
+
+
+def get_topological_order(graph: nx.DiGraph, is_reversed: bool = False) -> List[str]:
+    """Lexicographical topological order of the node ids of the provided graph
+
+    The order (and its reverse) is computed once and cached in the graph attributes, the cache is cleared by FreExGraph
+    when the graph is modified. The returned list should not be modified.
+
+    :param graph: networkx graph of a FreExGraph
+    :param is_reversed: retrieve the reverse topological order instead
+    :return: node ids sorted topologically
+    """
+    if is_reversed:
+        reversed_order = graph.graph.get(_reversed_topological_order_key)
+        if reversed_order is None:
+            reversed_order = get_topological_order(graph)[::-1]
+            graph.graph[_reversed_topological_order_key] = reversed_order
+        return reversed_order
+
+    topological_order = graph.graph.get(_topological_order_key)
+    if topological_order is None:
+        topological_order = list(nx.lexicographical_topological_sort(graph))
+        graph.graph[_topological_order_key] = topological_order
+    return topological_order
+
 
 class FreExNode:
     """Representation of the content of a node in the execution graph """
 
-    parents: Set[str]
+    __slots__ = (
+        "parents",
+        "extension_node",
+        "_id",
+        "_fork_id",
+        "_graph_ref",
+        "_depth",
+    )
+
+    parents: FrozenSet[str]
     """Parents of the node to add"""
 
     extension_node: bool
@@ -48,21 +105,22 @@ class FreExNode:
         uid: str = None,
         *,
         fork_id: Optional[str] = None,
-        parents: Set[str] = None,
+        parents: Iterable[str] = None,
         graph_ref: nx.DiGraph = None,
         extension_node: bool = False,
     ):
-        self.parents = parents or set()
+        self.parents = frozenset(parents or ())
         self.extension_node = extension_node
         self._graph_ref = graph_ref
         self._id = uid
         self._fork_id = fork_id
+        self._depth = 0
 
     # == PRIVATE ==
-    _id: str = None
-    _fork_id: Optional[str] = None
-    _graph_ref: nx.DiGraph = None
-    _depth: int = 0
+    _id: str
+    _fork_id: Optional[str]
+    _graph_ref: nx.DiGraph
+    _depth: int
 
     def __len__(self):
         return 1
@@ -81,7 +139,9 @@ class FreExNode:
         if isinstance(visitor, StandardVisitor):
             if self.extension_node and visitor.extension_depth_threshold():
                 with visitor.inc_extension_depth():
-                    self.accept(visitor)
+                    # visitation interrupted in the extension, no need to go further
+                    if not self.accept(visitor):
+                        return False
             return visitor.visit_standard(self)
         return self.accept(visitor)
 
@@ -141,16 +201,18 @@ RemovedParent = Tuple[FreExNode, Set[str]]
 
 
 class RootNode(FreExNode):
-    pass
+    __slots__ = ()
 
 
 class GraphNode(FreExNode):
     """Class representing a node that contains another graph, visitation on such graph go through the inner graph """
 
+    __slots__ = ("_graph_ex",)
+
     _graph_ex: "FreExGraph"
 
     def __init__(
-        self, uid: str = None, *, graph: "FreExGraph", parents: Set[str] = None
+        self, uid: str = None, *, graph: "FreExGraph", parents: Iterable[str] = None
     ):
         super().__init__(
             uid=uid, parents=parents, graph_ref=graph._graph, extension_node=True
@@ -191,30 +253,54 @@ class FreExGraph:
 
         The ordering of the node creation can be tedious, as it is required that every node parents already exists to be
         added. This ordering will be inferred making in this method/ it ease the way to create nodes, and to add them in
-        the graph.
+        the graph. The inference is a single topological sort (Kahn's algorithm) on the provided nodes.
 
         If such inference is impossible, an exception is thrown because of an impossibility to create the graph.
 
         :exception assert failure in case the node cannot be added to the graph (no proper link or node already exists)
         :param nodes: list of nodes to add in the graph, those nodes has to have the id field set
         """
-        nodes_sorted: List[AnyFreExNode] = [n for n in nodes if len(n.parents) == 0]
-        already_in_graph_id = set(self._graph)
-
-        def all_parents_already_in_list(n: AnyFreExNode) -> bool:
-            node_sorted_id = already_in_graph_id
-            node_sorted_id.update({s.id for s in nodes_sorted})
-            if n.id not in node_sorted_id:
-                return n.parents.issubset(node_sorted_id)
-            return False
-
-        while len(nodes_sorted) < len(nodes):
-            to_add = [n for n in nodes if all_parents_already_in_list(n)]
-            assert len(to_add) > 0, "provided nodes are not all linked together"
-            nodes_sorted.extend(to_add)
-
+        nodes_by_id: Dict[str, AnyFreExNode] = {n.id: n for n in nodes}
+        assert len(nodes_by_id) == len(nodes), "provided nodes contains duplicated ids"
+        for node in nodes:
+            self.__check_node_id(node)
+        missing_parents: Set[str] = {
+            p
+            for p in set().union(*(n.parents for n in nodes)).difference(nodes_by_id)
+            if p not in self._graph
+        }
+        assert (
+            len(missing_parents) == 0
+        ), f"provided nodes are not all linked together, missing parents {missing_parents}"
+
+        # Kahn's algorithm on the provided nodes, parents already in the graph are not taken into account
+        in_degree: Dict[str, int] = {}
+        children: Dict[str, List[str]] = defaultdict(list)
+        for node in nodes:
+            parents_to_add = [p for p in node.parents if p in nodes_by_id]
+            in_degree[node.id] = len(parents_to_add)
+            for parent in parents_to_add:
+                children[parent].append(node.id)
+
+        nodes_sorted: List[AnyFreExNode] = []
+        ready = deque(n.id for n in nodes if in_degree[n.id] == 0)
+        while ready:
+            node_id = ready.popleft()
+            nodes_sorted.append(nodes_by_id[node_id])
+            for child in children[node_id]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    ready.append(child)
+        assert len(nodes_sorted) == len(
+            nodes
+        ), "provided nodes are not all linked together"
+
+        # edges are added all at once, parents of each node are already inserted thanks to the topological order
+        edges: List[Tuple[str, str]] = []
         for node in nodes_sorted:
-            self.add_node(node)
+            edges.extend(self.__insert_node(node))
+        self._graph.add_edges_from(edges)
+        self._clear_topological_order()
 
     def add_node(self, node: AnyFreExNode) -> None:
         """Add a node in the graph
@@ -224,25 +310,13 @@ class FreExGraph:
         :param node: node to add in the execution graph, can be a normal content (FreExNode derived) or a node to
         contain a graph itself (GraphNode)
         """
-        assert (
-            node.fork_id is not None or ":" not in node.id
-        ), f"Node cannot contains a ':' in its id {node.id}"
-        assert not self._graph.has_node(
-            node.id
-        ), f"{node.id} is already in the execution graph"
+        self.__check_node_id(node)
         assert all(
             [self._graph.has_node(p) for p in node.parents]
         ), f"all node from parents ({node.parents}) has to be previously added in the execution graph"
 
-        node._graph_ref = self._graph
-        node._depth = self.__find_current_depth(node.parents)
-        self._graph.add_node(node.id, content=node)
-
-        if len(node.parents) == 0:
-            node.parents.add(root_node)
-
-        for parent in node.parents:
-            self._graph.add_edge(parent, node.id)
+        self._graph.add_edges_from(self.__insert_node(node))
+        self._clear_topological_order()
 
     def remove_node(self, node_id: str) -> None:
         """Remove the provided node and all its successors
@@ -252,6 +326,11 @@ class FreExGraph:
             for n in copy(self._graph.successors(node_id)):
                 self.remove_node(n)
             self._graph.remove_node(node_id)
+            self._clear_topological_order()
+
+    def __contains__(self, node_id: str) -> bool:
+        """:return: True if the node defined by the provided node_id is in the execution graph"""
+        return node_id in self._graph
 
     @property
     def root(self) -> FreExNode:
@@ -260,7 +339,12 @@ class FreExGraph:
 
     @property
     def graph(self) -> nx.DiGraph:
-        """retrieve a reference on the networkx.graph"""
+        """retrieve a reference on the networkx.graph
+
+        warning:
+            The topological order used for visitation is cached in the graph attributes. Modifying the networkx graph
+            directly (instead of using FreExGraph API) doesn't clear it.
+        """
         return self._graph
 
     def get_node(self, node_id: str) -> Optional[AnyFreExNode]:
@@ -268,50 +352,85 @@ class FreExGraph:
         :param node_id: id of the node to retrieve from the execution graph
         :return: node of the graph defined by provided node_id, None if not present in the execution graph
         """
-        if not self._graph.has_node(node_id):
+        node_data: Optional[dict] = self._graph.nodes.get(node_id)
+        if node_data is None:
             return None
-        return self._graph.nodes[node_id]["content"]
+        return node_data["content"]
+
+    def iter_sub_graph(
+        self,
+        from_node_id: str,
+        to_nodes_id: Optional[Union[str, Iterable[str]]] = None,
+    ) -> Iterator[FreExNode]:
+        """Iterate over the nodes of the sub graph that would be returned by sub_graph, without building it.
+
+        Nodes are yielded once each, in depth first order (which is not a topological order), and are the nodes of
+        this graph (not copies): their parents are not cleaned up. Modifying the graph while iterating is not
+        supported.
+
+        :param from_node_id: node from which the sub graph start
+        :param to_nodes_id: nodes (or single node) on which the sub graph stop, if none encountered, subgraph go until
+        the leaf nodes
+        :return: iterator over the nodes of the sub graph
+        """
+        from_node: FreExNode = self.get_node(from_node_id)
+        assert (
+            from_node is not None
+        ), f"Error sub graph from node {from_node_id}, node has to be in the execution graph"
+        if isinstance(to_nodes_id, str):
+            to_nodes_id = (to_nodes_id,)
+        stop_nodes_id: FrozenSet[str] = frozenset(to_nodes_id or ())
+        missing_to_nodes: Set[str] = stop_nodes_id.difference(self._graph)
+        assert (
+            len(missing_to_nodes) == 0
+        ), f"Error sub graph to node {', '.join(sorted(missing_to_nodes))}, node has to be in the execution graph"
+
+        # nodes are checked above when calling iter_sub_graph, not when starting the iteration
+        return self._iter_sub_graph(from_node, stop_nodes_id)
+
+    def _iter_sub_graph(
+        self, from_node: FreExNode, stop_nodes_id: FrozenSet[str]
+    ) -> Iterator[FreExNode]:
+        """Generator for iter_sub_graph, the provided nodes are expected to be checked already"""
+        visited: Set[str] = set()
+
+        # depth first traversal with an explicit stack (successors pushed in reverse to keep their order)
+        to_add: List[FreExNode] = [from_node]
+        while to_add:
+            current_node = to_add.pop()
+            if current_node.id in visited:
+                continue
+            visited.add(current_node.id)
+            yield current_node
+            if current_node.id in stop_nodes_id:
+                continue
+            for successor in reversed(list(self._graph.successors(current_node.id))):
+                to_add.append(self._graph.nodes[successor]["content"])
 
     def sub_graph(
         self,
         from_node_id: str,
-        to_nodes_id: Optional[List[str]] = None,
+        to_nodes_id: Optional[Union[str, Iterable[str]]] = None,
         return_removed_parents: bool = False,
     ) -> Union["FreExGraph", Tuple["FreExGraph", List[RemovedParent]]]:
         """Utility method to retrieve a subgraph from a given node until the end of the graph or until one of the
         provided node is encountered.
 
         :param from_node_id: node from which the sub graph start
-        :param to_nodes_id: nodes on which the sub graph stop, if none encountered, subgraph go until the leaf nodes
+        :param to_nodes_id: nodes (or single node) on which the sub graph stop, if none encountered, subgraph go until
+        the leaf nodes
         :param return_removed_parents: set to false by default, if set to true, return a second return tuple value that
         contains the removed parents in the subgraph
         :return: a sub graph delimited by the provided nodes id, if return_removed_parents set to true, also return a
         tuple that represent Tuple[node_that_got_parents_deleted, deleted_parent_links_set]
         """
-        from_node: FreExNode = self.get_node(from_node_id)
-        assert (
-            from_node is not None
-        ), f"Error sub graph from node {from_node_id}, node has to be in the execution graph"
-
-        nodes_in_subgraph: List[FreExNode] = []
-        nodes_in_subgraph_id: Set[str] = set()
-
-        def add_node_in_subgraph(current_node: FreExNode):
-            if current_node.id in nodes_in_subgraph_id:
-                return
-            nodes_in_subgraph.append(deepcopy(current_node))
-            nodes_in_subgraph_id.add(current_node.id)
-            if to_nodes_id is not None and current_node.id in to_nodes_id:
-                return
-            all_suc = list(self._graph.successors(current_node.id))
-            for successor in all_suc:
-                node_suc = self.get_node(successor)
-                assert (
-                    node_suc is not None
-                ), f"Error sub graph to node {node_suc.id}, node has to be in the execution graph"
-                add_node_in_subgraph(node_suc)
-
-        add_node_in_subgraph(from_node)
+        # the graph reference is not copied (the node is re-attached to the sub graph), otherwise the whole graph
+        # would be copied for each node of the sub graph
+        nodes_in_subgraph: List[FreExNode] = [
+            deepcopy(node, {id(self._graph): None})
+            for node in self.iter_sub_graph(from_node_id, to_nodes_id)
+        ]
+        nodes_in_subgraph_id: Set[str] = {n.id for n in nodes_in_subgraph}
 
         saved_removal: List[RemovedParent] = []
 
@@ -321,7 +440,7 @@ class FreExGraph:
                 saved_removal.append(
                     (n, {p for p in n.parents if p not in nodes_in_subgraph_id})
                 )
-            n.parents = {p for p in n.parents if p in nodes_in_subgraph_id}
+            n.parents = frozenset(p for p in n.parents if p in nodes_in_subgraph_id)
 
         sub_graph = FreExGraph()
         sub_graph.add_nodes(nodes_in_subgraph)
@@ -385,20 +504,20 @@ class FreExGraph:
             if root_node in node_to_fork_rename.parents:
                 initial_graph_node = self.get_node(node_to_fork_rename.id)
                 if root_node not in initial_graph_node.parents:
-                    node_to_fork_rename.parents.remove(root_node)
+                    node_to_fork_rename.parents -= {root_node}
 
             node_to_fork_rename._fork_id = forked_node.fork_id
             node_to_fork_rename._id = self._make_node_id_with_fork(
                 node_to_fork_rename.id, forked_node.fork_id
             )
-            node_to_fork_rename.parents = {
+            node_to_fork_rename.parents = frozenset(
                 self._make_node_id_with_fork(p, forked_node.fork_id)
                 for p in node_to_fork_rename.parents
-            }
+            )
 
         # redo linking
         for node, removed_parents in removed_parents:
-            node.parents.update(removed_parents)
+            node.parents |= removed_parents
 
         self.add_nodes([sub_graph.get_node(n) for n in sub_graph.graph.nodes])
 
@@ -419,6 +538,37 @@ class FreExGraph:
         to_replace.parents = previous_node.parents
         self._graph.nodes[to_replace.id]["content"] = to_replace
 
+    def __check_node_id(self, node: AnyFreExNode) -> None:
+        assert (
+            node.fork_id is not None or ":" not in node.id
+        ), f"Node cannot contains a ':' in its id {node.id}"
+        assert not self._graph.has_node(
+            node.id
+        ), f"{node.id} is already in the execution graph"
+
+    def __insert_node(self, node: AnyFreExNode) -> List[Tuple[str, str]]:
+        """Insert the node content in the graph without linking it to its parents
+
+        :param node: node to insert, its parents has to be in the graph already
+        :return: the edges (parent, node id) to add in the graph to link the node
+        """
+        # parents are interned as well (fork or runtime built ids are distinct objects from the node ids)
+        node._id = _intern_id(node.id)
+        node._graph_ref = self._graph
+        node._depth = self.__find_current_depth(node.parents)
+        self._graph.add_node(node.id, content=node)
+
+        if len(node.parents) == 0:
+            node.parents = frozenset((root_node,))
+        else:
+            node.parents = frozenset(_intern_id(p) for p in node.parents)
+        return [(parent, node.id) for parent in node.parents]
+
+    def _clear_topological_order(self) -> None:
+        """Clear the topological order cached in the graph, has to be called on any modification of the graph"""
+        self._graph.graph.pop(_topological_order_key, None)
+        self._graph.graph.pop(_reversed_topological_order_key, None)
+
     def __find_current_depth(self, parents: Set[str]) -> int:
         """
         Check the depth of all given parents, and return the biggest one + 1 (give the layer depth of the current node
@@ -426,13 +576,15 @@ class FreExGraph:
         :param parents: to check
         :return: the depth of the node that has the provided parents.
         """
-        if len(parents) == 0:
-            return 1
-        parent_nodes: List[dict] = [
-            dict(self._graph.nodes[key]) for key in parents if self._graph.has_node(key)
-        ]
-        depth = 0
-        for v in parent_nodes:
-            cmp = v["content"].depth
-            depth = cmp if depth < cmp else depth
-        return depth + 1
+        # depth is stored on each node when added, parents depth is read as is (never recomputed)
+        return (
+            max(
+                (
+                    self._graph.nodes[key]["content"].depth
+                    for key in parents
+                    if self._graph.has_node(key)
+                ),
+                default=0,
+            )
+            + 1
+        )
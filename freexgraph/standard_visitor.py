@@ -24,7 +24,7 @@ from contextlib import contextmanager
 
 import networkx as nx
 
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Dict
 
 from networkx import NetworkXNoCycle
 
@@ -33,6 +33,9 @@ from freexgraph.freexgraph import root_node
 
 
 class StandardVisitor:
+    # no instance layout, standard visitors declare the slots of the extension depth attributes themselves (defaults
+    # below are only used by subclasses that don't declare slots)
+    __slots__ = ()
 
     _current_extension_depth: int = 0
 
@@ -69,7 +72,14 @@ class FindFirstVisitor(AbstractVisitor, StandardVisitor):
     This is a mutable visitor : If a modification is to be done on the found node, it can be done in the predicate
     """
 
-    result: Optional[FreExNode] = None
+    __slots__ = (
+        "result",
+        "_predicate",
+        "_extension_depth_limit",
+        "_current_extension_depth",
+    )
+
+    result: Optional[FreExNode]
     """reference to the node found after visitation that follow the predicate, stay None if none found """
 
     _predicate: Callable
@@ -84,8 +94,10 @@ class FindFirstVisitor(AbstractVisitor, StandardVisitor):
          graph is executed
         """
         super().__init__(**kwargs)
+        self.result = None
         self._predicate = predicate
         self._extension_depth_limit = extension_depth_limit
+        self._current_extension_depth = 0
 
     def visit_standard(self, node: FreExNode) -> bool:
         if node.id != root_node and self._predicate(node):
@@ -102,6 +114,13 @@ class FindFirstVisitor(AbstractVisitor, StandardVisitor):
 
 
 class FindAllVisitor(AbstractVisitor, StandardVisitor):
+    __slots__ = (
+        "results",
+        "_predicate",
+        "_extension_depth_limit",
+        "_current_extension_depth",
+    )
+
     results: List[FreExNode]
     """reference list of nodes found after visitation that follow the predicate, stay None if none found """
 
@@ -120,6 +139,7 @@ class FindAllVisitor(AbstractVisitor, StandardVisitor):
         self.results = []
         self._predicate = predicate
         self._extension_depth_limit = extension_depth_limit
+        self._current_extension_depth = 0
 
     def visit_standard(self, node: FreExNode) -> bool:
         if node.id != root_node and self._predicate(node):
@@ -133,13 +153,67 @@ class FindAllVisitor(AbstractVisitor, StandardVisitor):
         return len(self.results)
 
 
+class MultiFindVisitor(AbstractVisitor, StandardVisitor):
+    """Find all the occurrences of nodes following each of the given predicates in a single visitation
+
+    Equivalent to a FindAllVisitor per predicate, but the graph is traversed only once.
+    """
+
+    __slots__ = (
+        "results",
+        "_predicates",
+        "_extension_depth_limit",
+        "_current_extension_depth",
+    )
+
+    results: Dict[str, List[FreExNode]]
+    """reference lists of nodes found after visitation indexed by predicate key, lists stay empty if none found """
+
+    _predicates: Dict[str, Callable]
+
+    def __init__(
+        self,
+        predicates: Dict[str, Callable],
+        extension_depth_limit: Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        :param predicates: dictionary of predicates, each has to take an argument (FreExNode type) and return a bool,
+         will determine what results are returned from the graph under the same key
+        :param extension_depth_limit: optional limitation of extension depth for the visitation, if 0, only the current
+         graph is executed
+        """
+        super().__init__(**kwargs)
+        self._predicates = predicates
+        self.results = {key: [] for key in predicates}
+        self._extension_depth_limit = extension_depth_limit
+        self._current_extension_depth = 0
+
+    def visit_standard(self, node: FreExNode) -> bool:
+        if node.id != root_node:
+            for key, predicate in self._predicates.items():
+                if predicate(node):
+                    self.results[key].append(node)
+        return True
+
+    def hook_start(self):
+        self.results = {key: [] for key in self._predicates}
+
+    def count(self, key: str) -> int:
+        return len(self.results[key])
+
+
 class LenCalculatorVisitor(AbstractVisitor, StandardVisitor):
+    __slots__ = ("result", "_extension_depth_limit", "_current_extension_depth")
+
     result: int
     """calculate the length of the graph"""
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.result = 0
+        self._extension_depth_limit = None
+        self._current_extension_depth = 0
 
     def visit_standard(self, node: FreExNode) -> bool:
         if node.id != root_node:
@@ -163,9 +237,17 @@ class ValidateGraphIntegrity(AbstractVisitor, StandardVisitor):
     * Check that the graph doesn't do a cycle (cyclic graph) Impossible by design, parent are checked at node add
     """
 
-    _first_check = True
+    __slots__ = ("_first_check", "_extension_depth_limit", "_current_extension_depth")
+
+    _first_check: bool
     """Checks that require to be done only once are not done for each node visit"""
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._first_check = True
+        self._extension_depth_limit = None
+        self._current_extension_depth = 0
+
     def visit_standard(self, node: FreExNode) -> bool:
         if self._first_check:
             try:
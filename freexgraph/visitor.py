@@ -21,12 +21,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import networkx as nx
+from typing import List, Set, Tuple, Callable, Optional, TYPE_CHECKING
 
-from typing import List, Tuple, Callable, Optional
-from tqdm import tqdm
+from freexgraph.freexgraph import (
+    FreExNode,
+    GraphNode,
+    AnyVisitor,
+    root_node,
+    get_topological_order,
+)
 
-from freexgraph.freexgraph import FreExNode, GraphNode, AnyVisitor, root_node
+if TYPE_CHECKING:
+    from tqdm import tqdm
 
 
 def _get_len(root: FreExNode, with_progress_bar: bool) -> int:
@@ -39,22 +45,23 @@ def _get_len(root: FreExNode, with_progress_bar: bool) -> int:
     return v.result
 
 
-def _filter_graph_root_for_visitation(root: FreExNode, is_reversed: bool):
+def _filter_graph_root_for_visitation(
+    root: FreExNode, is_reversed: bool
+) -> List[FreExNode]:
     if root.graph_ref is None:
         return [root]
     depth: int = root.depth
-    sorted_node_list = list(nx.lexicographical_topological_sort(root.graph_ref))
-    if is_reversed:
-        sorted_node_list = list(reversed(sorted_node_list))
+    graph_nodes = root.graph_ref.nodes
+    sorted_node_list = [
+        graph_nodes[node_id]["content"]
+        for node_id in get_topological_order(root.graph_ref, is_reversed)
+    ]
 
     if depth == 0:
         return sorted_node_list
-    node_content = [
-        root.graph_ref.nodes[node_id]["content"] for node_id in sorted_node_list
-    ]
     if is_reversed:
-        return [n.id for n in node_content if n.depth <= depth and n.id != root.id]
-    return [n.id for n in node_content if n.depth >= depth and n.id != root.id]
+        return [n for n in sorted_node_list if n.depth <= depth and n.id != root.id]
+    return [n for n in sorted_node_list if n.depth >= depth and n.id != root.id]
 
 
 class AbstractVisitor:
@@ -70,6 +77,8 @@ class AbstractVisitor:
         but it is not enforced in any way
     """
 
+    __slots__ = ("with_progress_bar", "is_reversed", "__custom_hooks", "progress_bar_")
+
     with_progress_bar: bool
     is_reversed: bool
 
@@ -77,7 +86,7 @@ class AbstractVisitor:
     __custom_hooks: List[Tuple[Callable, Callable]]
 
     # progress bar set
-    progress_bar_: Optional[tqdm] = None
+    progress_bar_: Optional["tqdm"]
 
     def __init__(
         self,
@@ -93,18 +102,32 @@ class AbstractVisitor:
         self.with_progress_bar = with_progress_bar
         self.is_reversed = is_reversed
         self.__custom_hooks = []
+        self.progress_bar_ = None
 
     def visit(self, root: FreExNode) -> bool:
         self.hook_start()
 
-        with tqdm(
-            total=_get_len(root, self.with_progress_bar),
-            disable=not self.with_progress_bar,
-            desc=f"Single Visitation {type(self).__name__:<24}",
-            leave=True,
-        ) as pbar:
-            self.progress_bar_ = pbar
-            not_interrupted = self.apply_visitation_(root)
+        sorted_node_list = _filter_graph_root_for_visitation(root, self.is_reversed)
+        if not sorted_node_list:
+            # nothing to visit, no need to set up the progress bar
+            self.hook_end()
+            return True
+
+        if not self.with_progress_bar:
+            # fast path: no progress bar to set up nor to update on each node
+            self.progress_bar_ = None
+            not_interrupted = self._visit_sorted_nodes(sorted_node_list)
+        else:
+            # tqdm is only imported when a progress bar is actually requested
+            from tqdm import tqdm
+
+            with tqdm(
+                total=_get_len(root, self.with_progress_bar),
+                desc=f"Single Visitation {type(self).__name__:<24}",
+                leave=True,
+            ) as pbar:
+                self.progress_bar_ = pbar
+                not_interrupted = self._visit_sorted_nodes(sorted_node_list)
 
         if not_interrupted:
             self.hook_end()
@@ -113,18 +136,18 @@ class AbstractVisitor:
 
     def apply_visitation_(self, root: FreExNode) -> bool:
         """do not override / directly use. Internal visitation method, use visit(root) instead"""
-        sorted_node_list = _filter_graph_root_for_visitation(root, self.is_reversed)
-
-        for node_id in sorted_node_list:
-            if len(sorted_node_list) == 1:
-                node = root
-            else:
-                node = root.graph_ref.nodes[node_id]["content"]
+        return self._visit_sorted_nodes(
+            _filter_graph_root_for_visitation(root, self.is_reversed)
+        )
 
-            # Trigger custom hook
-            for predicate, hook in self.__custom_hooks:
-                if node.id != root_node and predicate(node):
-                    hook(node)
+    def _visit_sorted_nodes(self, sorted_node_list: List[FreExNode]) -> bool:
+        custom_hooks = self.__custom_hooks
+        for node in sorted_node_list:
+            # Trigger custom hook (never on the root node)
+            if custom_hooks and node.id != root_node:
+                for predicate, hook in custom_hooks:
+                    if predicate(node):
+                        hook(node)
 
             if not node.apply_accept_(self):
                 return False
@@ -168,6 +191,14 @@ class AbstractVisitor:
 class VisitorComposer:
     """Class to compose visitor together"""
 
+    __slots__ = (
+        "_sequential_before",
+        "_action_composed",
+        "_sequential_after",
+        "_is_reversed",
+        "_with_progress_bar",
+    )
+
     _sequential_before: List[AnyVisitor]
     _action_composed: List[AnyVisitor]
     _sequential_after: List[AnyVisitor]
@@ -188,11 +219,11 @@ class VisitorComposer:
         :param after: list of visitor which will be sequentially executed after action
         :param progress_bar_on_actions: set to True to enable verbosity of the progress bar
         """
-        reversed_action: List[bool] = [rev.is_reversed for rev in actions]
-        assert all(reversed_action) or not any(
-            reversed_action
+        reversed_action: Set[bool] = {bool(rev.is_reversed) for rev in actions}
+        assert (
+            len(reversed_action) <= 1
         ), "Cannot compose reversed and non reversed Visitor together"
-        self._is_reversed = reversed_action[0] if len(reversed_action) > 0 else False
+        self._is_reversed = next(iter(reversed_action), False)
         self._with_progress_bar = progress_bar_on_actions
         self._action_composed = actions
         self._sequential_before = before or []
@@ -221,16 +252,16 @@ class VisitorComposer:
 
     def _composed_visit(self, root: FreExNode) -> bool:
         sorted_node_list = _filter_graph_root_for_visitation(root, self._is_reversed)
+        if not sorted_node_list:
+            return True
 
         self._produce_pg_bars(
             _get_len(root, self._with_progress_bar) * len(self._action_composed)
         )
-        for node_id in sorted_node_list:
+        for node in sorted_node_list:
             # do the visitation for the node on each action visitor
             for action_visitor in self._action_composed:
-                if not root.graph_ref.nodes[node_id]["content"].apply_accept_(
-                    action_visitor
-                ):
+                if not node.apply_accept_(action_visitor):
                     self._close_pg_bars()
                     return False
         self._close_pg_bars()
@@ -239,6 +270,8 @@ class VisitorComposer:
     def _produce_pg_bars(self, tqdm_len):
         if not self._with_progress_bar:
             return
+        from tqdm import tqdm
+
         bar = tqdm(
             total=tqdm_len,
             leave=True,
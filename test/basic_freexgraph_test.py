@@ -22,27 +22,34 @@
 # SOFTWARE.
 
 import pytest
-import uuid
 
-from typing import Optional
+from enum import Enum
+from typing import Optional, List
 
 from freexgraph.standard_visitor import FindFirstVisitor
 from freexgraph import GraphNode, FreExNode, FreExGraph
 
 
 class NodeForTest(FreExNode):
+    __slots__ = ()
+
     def accept(self, visitor) -> bool:
         return visitor.testing_visit(self)
 
 
-def test_make_exec_graph():
+def id_prefixes(ids: List[str]) -> List[str]:
+    """:return: prefixes of the provided ids generated by the unique_id fixture (id1_42 -> id1)"""
+    return [i.split("_", 1)[0] for i in ids]
+
+
+def test_make_exec_graph(unique_id):
     execution_graph = FreExGraph()
-    id1 = f"id1_{uuid.uuid4()}"
-    id2 = f"id2_{uuid.uuid4()}"
-    id3 = f"id3_{uuid.uuid4()}"
-    id3_bis = f"id3bis_{uuid.uuid4()}"
-    id4 = f"id4_{uuid.uuid4()}"
-    id5 = f"id5_{uuid.uuid4()}"
+    id1 = unique_id("id1")
+    id2 = unique_id("id2")
+    id3 = unique_id("id3")
+    id3_bis = unique_id("id3bis")
+    id4 = unique_id("id4")
+    id5 = unique_id("id5")
 
     execution_graph.add_node(FreExNode(id1)),
     execution_graph.add_node(FreExNode(id2, parents={id1})),
@@ -51,38 +58,62 @@ def test_make_exec_graph():
     execution_graph.add_node(FreExNode(id3_bis, parents={id4})),
     execution_graph.add_node(FreExNode(id5, parents={id4, id3})),
 
-    assert execution_graph._graph.has_node(id1)
+    assert id1 in execution_graph
     assert execution_graph.get_node(id1).depth == 1
 
-    assert execution_graph._graph.has_node(id2)
+    assert id2 in execution_graph
     assert execution_graph.get_node(id2).depth == 2
 
-    assert execution_graph._graph.has_node(id3)
+    assert id3 in execution_graph
     assert execution_graph.get_node(id3).depth == 4
 
-    assert execution_graph._graph.has_node(id3_bis)
+    assert id3_bis in execution_graph
     assert execution_graph.get_node(id3_bis).depth == 4
 
-    assert execution_graph._graph.has_node(id4)
+    assert id4 in execution_graph
     assert execution_graph.get_node(id4).depth == 3
 
-    assert execution_graph._graph.has_node(id5)
+    assert id5 in execution_graph
     assert execution_graph.get_node(id5).depth == 5
 
 
 def test_add_node_reserved_character():
     execution_graph = FreExGraph()
-    id1 = f"id1::{uuid.uuid4()}"
+    # the graph is empty, there is no need of unique ids
     with pytest.raises(AssertionError):
-        execution_graph.add_node(FreExNode(id1))
-    id1 = f"id1:{uuid.uuid4()}"
+        execution_graph.add_node(FreExNode("id1::reserved"))
     with pytest.raises(AssertionError):
-        execution_graph.add_node(FreExNode(id1))
+        execution_graph.add_node(FreExNode("id1:reserved"))
+
+
+class StepId(str, Enum):
+    FIRST = "first"
+    SECOND = "second"
+
+
+def test_add_node_str_subclass_id():
+    execution_graph = FreExGraph()
+    execution_graph.add_node(NodeForTest(StepId.FIRST))
+    execution_graph.add_nodes([NodeForTest(StepId.SECOND, parents={StepId.FIRST})])
+
+    assert StepId.FIRST in execution_graph
+    assert execution_graph.get_node("second").parents == {"first"}
+
+
+def test_node_and_parent_ids_interned():
+    execution_graph = FreExGraph()
+    # ids built at runtime are distinct str objects
+    execution_graph.add_node(NodeForTest("".join(["run", "time"])))
+    execution_graph.add_node(NodeForTest("child", parents={"".join(["run", "time"])}))
+
+    (parent_id,) = execution_graph.get_node("child").parents
+    assert parent_id is execution_graph.get_node("runtime").id
 
 
 def test_get_not_existing(valid_basic_execution_graph):
     node: Optional[FreExNode] = valid_basic_execution_graph.get_node("NOT_EXISTING")
     assert node is None
+    assert "NOT_EXISTING" not in valid_basic_execution_graph
 
 
 def test_visitation(valid_basic_execution_graph, visitor_test, node_test_class):
@@ -98,21 +129,14 @@ def test_visitation(valid_basic_execution_graph, visitor_test, node_test_class):
     visitor_test.visit(valid_basic_execution_graph.root)
 
     assert visitor_test.end
-    assert len(visitor_test.visited) == 5
-    assert visitor_test.visited[0].startswith("id1_")
-    assert visitor_test.visited[1].startswith("id2_")
-    assert visitor_test.visited[2].startswith("id4_")
-    assert visitor_test.visited[3].startswith("id3_")
-    assert visitor_test.visited[4].startswith("id5_")
+    assert id_prefixes(visitor_test.visited) == ["id1", "id2", "id4", "id3", "id5"]
 
     # check that modification of the node
     id5 = visitor_test.visited[4]
     node_5 = valid_basic_execution_graph.get_node(id5)
     assert node_5.metadata is None
     assert node_5.fork_id is None
-    assert sorted(node_5.parents) == sorted(
-        {visitor_test.visited[3], visitor_test.visited[2]}
-    )
+    assert node_5.parents == {visitor_test.visited[3], visitor_test.visited[2]}
 
     valid_basic_execution_graph.replace_node(
         node_test_class(
@@ -127,38 +151,36 @@ def test_visitation(valid_basic_execution_graph, visitor_test, node_test_class):
     node_5 = valid_basic_execution_graph.get_node(id5)
     assert node_5.metadata == "ChocoboForTheWin"
     assert node_5.fork_id is None
-    assert sorted(node_5.parents) == sorted(
-        {visitor_test.visited[3], visitor_test.visited[2]}
-    )
-
+    assert node_5.parents == {visitor_test.visited[3], visitor_test.visited[2]}
 
-# used only in test_visitation_custom_hook and never somewhere else
-test_visitation_custom_hook_count = [0, 0]
 
-
-def test_visitation_custom_hook(visitor_test, node_test_class):
+def test_visitation_custom_hook(visitor_test, node_test_class, unique_id):
     execution_graph = FreExGraph()
-    id1 = f"id1_{uuid.uuid4()}"
-    id2 = f"id2_{uuid.uuid4()}"
-    id3 = f"id3_{uuid.uuid4()}"
-    id3_bis = f"id3bis_{uuid.uuid4()}"
-    id4 = f"id4_{uuid.uuid4()}"
-    id5 = f"id5_{uuid.uuid4()}"
-
-    execution_graph.add_node(node_test_class(id1)),
-    execution_graph.add_node(node_test_class(id2, parents={id1})),
-    execution_graph.add_node(node_test_class(id4, parents={id2})),
-    execution_graph.add_node(node_test_class(id3, parents={id2, id4})),
-    execution_graph.add_node(node_test_class(id3_bis, parents={id4})),
-    execution_graph.add_node(node_test_class(id5, parents={id4, id3})),
+    id1 = unique_id("id1")
+    id2 = unique_id("id2")
+    id3 = unique_id("id3")
+    id3_bis = unique_id("id3bis")
+    id4 = unique_id("id4")
+    id5 = unique_id("id5")
+
+    execution_graph.add_nodes(
+        [
+            node_test_class(id1),
+            node_test_class(id2, parents={id1}),
+            node_test_class(id4, parents={id2}),
+            node_test_class(id3, parents={id2, id4}),
+            node_test_class(id3_bis, parents={id4}),
+            node_test_class(id5, parents={id4, id3}),
+        ]
+    )
+
+    hook_count = [0, 0]
 
     def hook(_):
-        global test_visitation_custom_hook_count
-        test_visitation_custom_hook_count[0] += 1
+        hook_count[0] += 1
 
     def hook_2(_):
-        global test_visitation_custom_hook_count
-        test_visitation_custom_hook_count[1] += 1
+        hook_count[1] += 1
 
     visitor_test.register_custom_hook(
         predicate=lambda n: n.id.startswith("id3"), hook=hook
@@ -171,11 +193,10 @@ def test_visitation_custom_hook(visitor_test, node_test_class):
 
     assert visitor_test.end
     assert len(visitor_test.visited) == 6
-    assert test_visitation_custom_hook_count[0] == 2
-    assert test_visitation_custom_hook_count[1] == 4
+    assert hook_count == [2, 4]
 
 
-def test_graph_node(valid_basic_execution_graph, visitor_test):
+def test_graph_node(valid_basic_execution_graph, visitor_test_with_bar, unique_id):
     #
     #                ida
     #                 |
@@ -188,50 +209,54 @@ def test_graph_node(valid_basic_execution_graph, visitor_test):
     #          ide
 
     execution_graph = FreExGraph()
-    ida = f"ida_{uuid.uuid4()}"
-    idb = f"idb_{uuid.uuid4()}"
-    idc = f"idc_{uuid.uuid4()}"
-    id_graph = f"idg_{uuid.uuid4()}"
-    idd = f"idd_{uuid.uuid4()}"
-    ide = f"ide_{uuid.uuid4()}"
-
-    execution_graph.add_node(NodeForTest(ida))
-    execution_graph.add_node(NodeForTest(idb, parents={ida}))
-    execution_graph.add_node(NodeForTest(idd, parents={idb}))
-    execution_graph.add_node(
-        GraphNode(id_graph, parents={idb, idd}, graph=valid_basic_execution_graph)
+    ida = unique_id("ida")
+    idb = unique_id("idb")
+    idc = unique_id("idc")
+    id_graph = unique_id("idg")
+    idd = unique_id("idd")
+    ide = unique_id("ide")
+
+    execution_graph.add_nodes(
+        [
+            NodeForTest(ida),
+            NodeForTest(idb, parents={ida}),
+            NodeForTest(idd, parents={idb}),
+            GraphNode(id_graph, parents={idb, idd}, graph=valid_basic_execution_graph),
+            NodeForTest(idc, parents={idd}),
+            NodeForTest(ide, parents={idd, id_graph}),
+        ]
     )
-    execution_graph.add_node(NodeForTest(idc, parents={idd}))
-    execution_graph.add_node(NodeForTest(ide, parents={idd, id_graph}))
 
-    visitor_test.visit(execution_graph.root)
+    visitor_test_with_bar.visit(execution_graph.root)
+
+    assert visitor_test_with_bar.end
+    # nodes of the inner graph (id1 to id5) are visited in place of the graph node
+    assert id_prefixes(visitor_test_with_bar.visited) == [
+        "ida",
+        "idb",
+        "idd",
+        "idc",
+        "id1",
+        "id2",
+        "id4",
+        "id3",
+        "id5",
+        "ide",
+    ]
 
-    assert visitor_test.end
-    assert len(visitor_test.visited) == 10
-    assert visitor_test.visited[0].startswith("ida_")
     assert execution_graph.get_node(ida).depth == 1
-    assert visitor_test.visited[1].startswith("idb_")
     assert execution_graph.get_node(idb).depth == 2
-    assert visitor_test.visited[2].startswith("idd_")
     assert execution_graph.get_node(idd).depth == 3
-
-    assert visitor_test.visited[3].startswith("idc_")
-
     assert execution_graph.get_node(idc).depth == 4
     assert execution_graph.get_node(id_graph).depth == 4
-
-    assert visitor_test.visited[4].startswith("id1_")
-    assert visitor_test.visited[5].startswith("id2_")
-    assert visitor_test.visited[6].startswith("id4_")
-    assert visitor_test.visited[7].startswith("id3_")
-    assert visitor_test.visited[8].startswith("id5_")
-
-    assert visitor_test.visited[9].startswith("ide_")
     assert execution_graph.get_node(ide).depth == 5
 
-    assert len(visitor_test.inner_graph_started) == 1
-    assert visitor_test.inner_graph_started[0].startswith(id_graph)
-    assert visitor_test.inner_graph_started == visitor_test.inner_graph_ended
+    assert len(visitor_test_with_bar.inner_graph_started) == 1
+    assert visitor_test_with_bar.inner_graph_started[0].startswith(id_graph)
+    assert (
+        visitor_test_with_bar.inner_graph_started
+        == visitor_test_with_bar.inner_graph_ended
+    )
 
     # test find in graph node from root
     finder = FindFirstVisitor(lambda n: n.id.startswith("id3"))
@@ -253,13 +278,13 @@ def test_add_nodes(node_list_complex_graph, visitor_test):
 def test_add_nodes_not_properly_connected_nodes(node_list_complex_graph):
     node_list_complex_graph.append(NodeForTest("X", parents={"NOT_EXISTING"}))
     execution_graph = FreExGraph()
-    with pytest.raises(AssertionError):
+    with pytest.raises(AssertionError, match="NOT_EXISTING"):
         execution_graph.add_nodes(node_list_complex_graph)
 
 
 def test_add_nodes_multiple_nodes_same_id(node_list_complex_graph):
     # K is already in graph
-    assert "K" in [n.id for n in node_list_complex_graph]
+    assert "K" in {n.id for n in node_list_complex_graph}
 
     # adding another K fail
     node_list_complex_graph.append(NodeForTest("K"))
@@ -291,93 +316,25 @@ def test_add_not_linked_nodes_on_already_created_graph(valid_complex_graph):
         valid_complex_graph.add_nodes(to_add)
 
 
-def test_delete_one_node(visitor_test):
-    #
-    #                ida
-    #                 |
-    #                idb
-    #              /  |
-    #          idd    |
-    #        /  |  \  |
-    #      idc  |    idx
-    #           |  /
-    #          ide
-
-    execution_graph = FreExGraph()
-    ida = f"ida_{uuid.uuid4()}"
-    idb = f"idb_{uuid.uuid4()}"
-    idc = f"idc_{uuid.uuid4()}"
-    idx = f"idx_{uuid.uuid4()}"
-    idd = f"idd_{uuid.uuid4()}"
-    ide = f"ide_{uuid.uuid4()}"
-
-    execution_graph.add_node(NodeForTest(ida))
-    execution_graph.add_node(NodeForTest(idb, parents={ida}))
-    execution_graph.add_node(NodeForTest(idd, parents={idb}))
-    execution_graph.add_node(NodeForTest(idx, parents={idb, idd}))
-    execution_graph.add_node(NodeForTest(idc, parents={idd}))
-    execution_graph.add_node(NodeForTest(ide, parents={idd, idx}))
-
-    visitor_test.visit(execution_graph.root)
-
+@pytest.mark.parametrize(
+    "to_remove, expected_visited",
+    [
+        # should only remove ide
+        ("ide", ["ida", "idb", "idd", "idc", "idx"]),
+        # should remove idc, ide and idx
+        ("idd", ["ida", "idb"]),
+    ],
+    ids=["one_node", "node_with_childs"],
+)
+def test_delete_node(diamond_graph, visitor_test, to_remove, expected_visited):
+    visitor_test.visit(diamond_graph.root)
     assert len(visitor_test.visited) == 6
 
-    assert ide in visitor_test.visited
-
-    # should only remove ide
-    execution_graph.remove_node(ide)
-
-    visitor_test.visit(execution_graph.root)
-
-    assert len(visitor_test.visited) == 5
-
-    assert ide not in visitor_test.visited
-
-    assert ida == visitor_test.visited[0]
-    assert idb == visitor_test.visited[1]
-    assert idd == visitor_test.visited[2]
-    assert idc == visitor_test.visited[3]
-    assert idx == visitor_test.visited[4]
-
+    diamond_graph.remove_node(to_remove)
 
-def test_delete_node_with_childs(visitor_test):
-    #
-    #                ida
-    #                 |
-    #                idb
-    #              /  |
-    #          idd    |
-    #        /  |  \  |
-    #      idc  |    idx
-    #           |  /
-    #          ide
-
-    execution_graph = FreExGraph()
-    ida = f"ida_{uuid.uuid4()}"
-    idb = f"idb_{uuid.uuid4()}"
-    idc = f"idc_{uuid.uuid4()}"
-    idx = f"idx_{uuid.uuid4()}"
-    idd = f"idd_{uuid.uuid4()}"
-    ide = f"ide_{uuid.uuid4()}"
-
-    execution_graph.add_node(NodeForTest(ida))
-    execution_graph.add_node(NodeForTest(idb, parents={ida}))
-    execution_graph.add_node(NodeForTest(idd, parents={idb}))
-    execution_graph.add_node(NodeForTest(idx, parents={idb, idd}))
-    execution_graph.add_node(NodeForTest(idc, parents={idd}))
-    execution_graph.add_node(NodeForTest(ide, parents={idd, idx}))
-
-    # should remove idc, ide and idx
-    execution_graph.remove_node(idd)
-
-    visitor_test.visit(execution_graph.root)
-
-    assert len(visitor_test.visited) == 2
-
-    assert ide not in visitor_test.visited
-
-    assert ida == visitor_test.visited[0]
-    assert idb == visitor_test.visited[1]
+    visitor_test.visit(diamond_graph.root)
+    assert visitor_test.visited == expected_visited
+    assert to_remove not in diamond_graph
 
 
 def test_predecessors_successors(valid_basic_execution_graph):
@@ -400,12 +357,9 @@ def test_predecessors_successors(valid_basic_execution_graph):
 
 
 def test_middle_visitation_start(valid_complex_graph):
-    v = FindFirstVisitor(lambda node: node.id == "F")
-    v.visit(valid_complex_graph.root)
-
-    f_node = v.result
-    assert v.found()
-    assert f_node.id == "F"
+    # id is known, no need of a visitation to retrieve the node
+    f_node = valid_complex_graph.get_node("F")
+    assert f_node is not None
 
     # G and F are at the same level and thus are always executed on partial visitation
     find_g = FindFirstVisitor(lambda node: node.id == "G")
@@ -424,3 +378,70 @@ def test_middle_visitation_start(valid_complex_graph):
     assert not v.found()
     find_g.visit(f_node)
     assert find_g.found()
+
+
+def test_visitation_start_from_last_node(valid_basic_execution_graph, visitor_test):
+    v = FindFirstVisitor(lambda node: node.id.startswith("id5"))
+    v.visit(valid_basic_execution_graph.root)
+
+    # nothing is left to visit after id5, hooks are still called
+    assert visitor_test.visit(v.result)
+    assert visitor_test.start
+    assert visitor_test.end
+    assert len(visitor_test.visited) == 0
+
+
+def test_add_nodes_cycle_in_provided_nodes(valid_complex_graph):
+    to_add = [
+        NodeForTest("X", parents={"A", "Z"}),
+        NodeForTest("Y", parents={"X"}),
+        NodeForTest("Z", parents={"Y"}),
+    ]
+    with pytest.raises(AssertionError):
+        valid_complex_graph.add_nodes(to_add)
+    # nothing is added if the nodes cannot be sorted
+    assert "X" not in valid_complex_graph
+
+
+def test_visitation_start_with_single_node_left(
+    valid_basic_execution_graph, visitor_test
+):
+    v = FindFirstVisitor(lambda node: node.id.startswith("id3"))
+    v.visit(valid_basic_execution_graph.root)
+
+    # only id5 is deeper than id3
+    visitor_test.visit(v.result)
+    assert len(visitor_test.visited) == 1
+    assert visitor_test.visited[0].startswith("id5_")
+
+
+def test_visitation_after_adding_node(valid_complex_graph, visitor_test):
+    visitor_test.visit(valid_complex_graph.root)
+    assert len(visitor_test.visited) == 13
+
+    # topological order computed by the previous visitation is not re-used
+    valid_complex_graph.add_node(NodeForTest("N", parents={"M"}))
+    visitor_test.visit(valid_complex_graph.root)
+    assert len(visitor_test.visited) == 14
+    assert visitor_test.visited[-1] == "N"
+
+
+def test_node_parents_from_iterable(valid_complex_graph):
+    valid_complex_graph.add_node(NodeForTest("N", parents=["A", "K", "A"]))
+
+    node = valid_complex_graph.get_node("N")
+    assert isinstance(node.parents, frozenset)
+    assert node.parents == {"A", "K"}
+    assert node.depth == valid_complex_graph.get_node("K").depth + 1
+
+
+def test_reversed_visitation_after_adding_node(valid_complex_graph, visitor_test):
+    visitor_test.is_reversed = True
+    visitor_test.visit(valid_complex_graph.root)
+    assert len(visitor_test.visited) == 13
+
+    # reversed topological order computed by the previous visitation is not re-used
+    valid_complex_graph.add_node(NodeForTest("N", parents={"M"}))
+    visitor_test.visit(valid_complex_graph.root)
+    assert len(visitor_test.visited) == 14
+    assert visitor_test.visited[0] == "N"
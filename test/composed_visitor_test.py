@@ -21,204 +21,139 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import List
+import pytest
+
+from typing import List, Tuple, Iterable
 
 from freexgraph import AbstractVisitor, FreExNode, VisitorComposer
 
 
 class ComposeVisitor(AbstractVisitor):
-    visited: List[str]
+    __slots__ = (
+        "visited_count",
+        "name_visitor",
+        "is_action",
+        "before_this",
+        "after_this",
+    )
+
+    # only the number of visited node is needed to check the ordering between visitors
+    visited_count: int
     name_visitor: str
 
     is_action: bool
 
-    before_this: list
-    after_this: list
+    before_this: Tuple["ComposeVisitor", ...]
+    after_this: Tuple["ComposeVisitor", ...]
 
     def __init__(
         self,
         name: str,
         *,
-        before_this: list = None,
-        after_this: list = None,
+        before_this: Iterable["ComposeVisitor"] = (),
+        after_this: Iterable["ComposeVisitor"] = (),
         is_action: bool = False
     ):
         super().__init__()
-        self.visited = []
+        self.visited_count = 0
         self.is_action = is_action
         self.name_visitor = name
-        self.before_this = before_this or []
-        self.after_this = after_this or []
+        self.before_this = tuple(before_this)
+        self.after_this = tuple(after_this)
 
     def testing_visit(self, node: FreExNode):
-        self.visited.append(node.id)
+        self.visited_count += 1
         if self.is_action:
-            assert all([len(b.visited) == len(self.visited) for b in self.before_this])
+            assert all(b.visited_count == self.visited_count for b in self.before_this)
             assert all(
-                [len(a.visited) == (len(self.visited) - 1) for a in self.after_this]
+                a.visited_count == (self.visited_count - 1) for a in self.after_this
             )
         else:
             if len(self.before_this) > 0:
-                size = len(self.before_this[0].visited)
-                assert all([len(b.visited) == size for b in self.before_this])
+                size = self.before_this[0].visited_count
+                assert all(b.visited_count == size for b in self.before_this)
 
-            assert all([len(b.visited) >= len(self.visited) for b in self.before_this])
-            assert all([len(a.visited) == 0 for a in self.after_this])
+            assert all(b.visited_count >= self.visited_count for b in self.before_this)
+            assert all(a.visited_count == 0 for a in self.after_this)
 
         return True
 
 
-def test_simple_composition_visitor_before_action(valid_basic_execution_graph):
-    visit_before_a = ComposeVisitor("a")
-    visit_before_b = ComposeVisitor("b", before_this=[visit_before_a])
-    visit_before_c = ComposeVisitor("c", before_this=[visit_before_a, visit_before_b])
-    visit_before_d = ComposeVisitor(
-        "d", before_this=[visit_before_a, visit_before_b, visit_before_c]
-    )
-    visit_before_a.after_this = [visit_before_b, visit_before_c, visit_before_d]
-    visit_before_b.after_this = [visit_before_c, visit_before_d]
-    visit_before_c.after_this = [visit_before_d]
-
-    all_before = [visit_before_a, visit_before_b, visit_before_c, visit_before_d]
-    action = ComposeVisitor("action_1", is_action=True)
-
-    visitor_composed = VisitorComposer([action], before=all_before)
-    visitor_composed.visit(valid_basic_execution_graph.root)
-
+class _CallCounter(AbstractVisitor):
+    """Visitor counting the visit and hook calls made on it"""
 
-def test_simple_composition_visitor_action_after(valid_basic_execution_graph):
-    visit_after_a = ComposeVisitor("a")
-    visit_after_b = ComposeVisitor("b", before_this=[visit_after_a])
-    visit_after_c = ComposeVisitor("c", before_this=[visit_after_a, visit_after_b])
-    visit_after_d = ComposeVisitor(
-        "d", before_this=[visit_after_a, visit_after_b, visit_after_c]
-    )
-    visit_after_a.after_this = [visit_after_b, visit_after_c, visit_after_d]
-    visit_after_b.after_this = [visit_after_c, visit_after_d]
-    visit_after_c.after_this = [visit_after_d]
-
-    all_after = [visit_after_a, visit_after_b, visit_after_c, visit_after_d]
-    action = ComposeVisitor("action_1", is_action=True)
+    __slots__ = ("visit_calls", "start_calls", "end_calls")
 
-    visitor_composed = VisitorComposer([action], after=all_after)
-    visitor_composed.visit(valid_basic_execution_graph.root)
+    visit_calls: int
+    start_calls: int
+    end_calls: int
 
+    def __init__(self):
+        super().__init__()
+        self.visit_calls = 0
+        self.start_calls = 0
+        self.end_calls = 0
 
-def test_simple_composition_visitor_before_after(valid_basic_execution_graph):
-    visit_before_a = ComposeVisitor("a")
-    visit_before_b = ComposeVisitor("b", before_this=[visit_before_a])
-    visit_before_c = ComposeVisitor("c", before_this=[visit_before_a, visit_before_b])
-    visit_before_d = ComposeVisitor(
-        "d", before_this=[visit_before_a, visit_before_b, visit_before_c]
-    )
-    visit_after_a = ComposeVisitor("a")
-    visit_before_a.after_this = [visit_before_b, visit_before_c, visit_before_d]
-    visit_before_b.after_this = [visit_before_c, visit_before_d]
-    visit_before_c.after_this = [visit_before_d]
-    visit_after_b = ComposeVisitor("b", before_this=[visit_after_a])
-    visit_after_c = ComposeVisitor("c", before_this=[visit_after_a, visit_after_b])
-    visit_after_d = ComposeVisitor(
-        "d", before_this=[visit_after_a, visit_after_b, visit_after_c]
-    )
-    visit_after_a.after_this = [visit_after_b, visit_after_c, visit_after_d]
-    visit_after_b.after_this = [visit_after_c, visit_after_d]
-    visit_after_c.after_this = [visit_after_d]
-
-    all_after = [visit_after_a, visit_after_b, visit_after_c, visit_after_d]
-    all_before = [visit_before_a, visit_before_b, visit_before_c, visit_before_d]
-    action = ComposeVisitor("action_1", is_action=True)
-
-    visitor_composed = VisitorComposer([action], before=all_before, after=all_after)
-    visitor_composed.visit(valid_basic_execution_graph.root)
+    def visit(self, root: FreExNode) -> bool:
+        self.visit_calls += 1
+        return super().visit(root)
 
+    def hook_start(self):
+        self.start_calls += 1
 
-def test_composition_multi_action(valid_basic_execution_graph):
-    visit_action_a = ComposeVisitor("a", is_action=True)
-    visit_action_b = ComposeVisitor("b", before_this=[visit_action_a], is_action=True)
-    visit_action_c = ComposeVisitor(
-        "c", before_this=[visit_action_a, visit_action_b], is_action=True
-    )
-    visit_action_d = ComposeVisitor(
-        "d",
-        before_this=[visit_action_a, visit_action_b, visit_action_c],
-        is_action=True,
-    )
-    visit_action_a.after_this = [visit_action_b, visit_action_c, visit_action_d]
-    visit_action_b.after_this = [visit_action_c, visit_action_d]
-    visit_action_c.after_this = [visit_action_d]
+    def hook_end(self):
+        self.end_calls += 1
 
-    all_action = [visit_action_a, visit_action_b, visit_action_c, visit_action_d]
-    visitor_composed = VisitorComposer(all_action)
-    visitor_composed.visit(valid_basic_execution_graph.root)
+    def testing_visit(self, node: FreExNode):
+        return True
 
 
-def test_composition_before_multi_action(valid_basic_execution_graph):
-    visit_action_a = ComposeVisitor("a", is_action=True)
-    visit_action_b = ComposeVisitor("b", before_this=[visit_action_a], is_action=True)
-    visit_action_c = ComposeVisitor(
-        "c", before_this=[visit_action_a, visit_action_b], is_action=True
+def _make_linear_chain(*, is_action: bool = False) -> List[ComposeVisitor]:
+    """:return: visitors a, b, c, d expected to visit each node in this order"""
+    a = ComposeVisitor("a", is_action=is_action)
+    b = ComposeVisitor("b", before_this=(a,), is_action=is_action)
+    c = ComposeVisitor("c", before_this=(a, b), is_action=is_action)
+    d = ComposeVisitor("d", before_this=(a, b, c), is_action=is_action)
+    a.after_this = (b, c, d)
+    b.after_this = (c, d)
+    c.after_this = (d,)
+    return [a, b, c, d]
+
+
+@pytest.mark.parametrize(
+    "with_before, multi_action, with_after",
+    [
+        (True, False, False),
+        (False, False, True),
+        (True, False, True),
+        (False, True, False),
+        (True, True, False),
+    ],
+    ids=[
+        "before_action",
+        "action_after",
+        "before_action_after",
+        "multi_action",
+        "before_multi_action",
+    ],
+)
+def test_composition(valid_tiny_graph, with_before, multi_action, with_after):
+    all_before = _make_linear_chain() if with_before else []
+    all_action = (
+        _make_linear_chain(is_action=True)
+        if multi_action
+        else [ComposeVisitor("action_1", is_action=True)]
     )
-    visit_action_d = ComposeVisitor(
-        "d",
-        before_this=[visit_action_a, visit_action_b, visit_action_c],
-        is_action=True,
-    )
-    visit_action_a.after_this = [visit_action_b, visit_action_c, visit_action_d]
-    visit_action_b.after_this = [visit_action_c, visit_action_d]
-    visit_action_c.after_this = [visit_action_d]
-    visit_before_a = ComposeVisitor("a")
-    visit_before_b = ComposeVisitor("b", before_this=[visit_before_a])
-    visit_before_c = ComposeVisitor("c", before_this=[visit_before_a, visit_before_b])
-    visit_before_d = ComposeVisitor(
-        "d", before_this=[visit_before_a, visit_before_b, visit_before_c]
-    )
-    visit_before_a.after_this = [visit_before_b, visit_before_c, visit_before_d]
-    visit_before_b.after_this = [visit_before_c, visit_before_d]
-    visit_before_c.after_this = [visit_before_d]
-
-    all_before = [visit_before_a, visit_before_b, visit_before_c, visit_before_d]
-    all_action = [visit_action_a, visit_action_b, visit_action_c, visit_action_d]
+    all_after = _make_linear_chain() if with_after else []
 
-    visitor_composed = VisitorComposer(all_action, before=all_before)
-    visitor_composed.visit(valid_basic_execution_graph.root)
+    visitor_composed = VisitorComposer(all_action, before=all_before, after=all_after)
+    assert visitor_composed.visit(valid_tiny_graph.root)
 
 
 def test_complete_composition(valid_complex_graph):
-    visit_action_a = ComposeVisitor("a", is_action=True)
-    visit_action_b = ComposeVisitor("b", before_this=[visit_action_a], is_action=True)
-    visit_action_c = ComposeVisitor(
-        "c", before_this=[visit_action_a, visit_action_b], is_action=True
-    )
-    visit_action_d = ComposeVisitor(
-        "d",
-        before_this=[visit_action_a, visit_action_b, visit_action_c],
-        is_action=True,
-    )
-    visit_action_a.after_this = [visit_action_b, visit_action_c, visit_action_d]
-    visit_action_b.after_this = [visit_action_c, visit_action_d]
-    visit_action_c.after_this = [visit_action_d]
-    visit_before_a = ComposeVisitor("a")
-    visit_before_b = ComposeVisitor("b", before_this=[visit_before_a])
-    visit_before_c = ComposeVisitor("c", before_this=[visit_before_a, visit_before_b])
-    visit_before_d = ComposeVisitor(
-        "d", before_this=[visit_before_a, visit_before_b, visit_before_c]
-    )
-    visit_before_a.after_this = [visit_before_b, visit_before_c, visit_before_d]
-    visit_before_b.after_this = [visit_before_c, visit_before_d]
-    visit_before_c.after_this = [visit_before_d]
-    visit_after_a = ComposeVisitor("a")
-    visit_after_b = ComposeVisitor("b", before_this=[visit_after_a])
-    visit_after_c = ComposeVisitor("c", before_this=[visit_after_a, visit_after_b])
-    visit_after_d = ComposeVisitor(
-        "d", before_this=[visit_after_a, visit_after_b, visit_after_c]
-    )
-    visit_after_a.after_this = [visit_after_b, visit_after_c, visit_after_d]
-    visit_after_b.after_this = [visit_after_c, visit_after_d]
-    visit_after_c.after_this = [visit_after_d]
-
-    all_after = [visit_after_a, visit_after_b, visit_after_c, visit_after_d]
-    all_before = [visit_before_a, visit_before_b, visit_before_c, visit_before_d]
-    all_action = [visit_action_a, visit_action_b, visit_action_c, visit_action_d]
+    all_before = _make_linear_chain()
+    all_action = _make_linear_chain(is_action=True)
+    all_after = _make_linear_chain()
 
     visitor_composed = VisitorComposer(
         all_action, before=all_before, after=all_after, progress_bar_on_actions=True
@@ -227,31 +162,26 @@ def test_complete_composition(valid_complex_graph):
 
 
 def test_start_end_hook_count_composed_visitor(valid_graph_with_subgraphs):
-    from unittest.mock import MagicMock
-
-    before_1 = MagicMock()
-    before_2 = MagicMock()
-    act1 = MagicMock()
-    act2 = MagicMock()
-    act3 = MagicMock()
-    after_1 = MagicMock()
-    after_2 = MagicMock()
+    before_1 = _CallCounter()
+    before_2 = _CallCounter()
+    act1 = _CallCounter()
+    act2 = _CallCounter()
+    act3 = _CallCounter()
+    after_1 = _CallCounter()
+    after_2 = _CallCounter()
     visitor_composed = VisitorComposer(
         [act1, act2, act3], before=[before_1, before_2], after=[after_1, after_2]
     )
     visitor_composed.visit(valid_graph_with_subgraphs.root)
 
-    assert act1.hook_start.call_count == 1
-    assert act1.hook_end.call_count == 1
-
-    assert act2.hook_start.call_count == 1
-    assert act2.hook_end.call_count == 1
-
-    assert act3.hook_start.call_count == 1
-    assert act3.hook_end.call_count == 1
+    # action visitors are not visited directly, hooks are called by the composer
+    for act in [act1, act2, act3]:
+        assert act.visit_calls == 0
+        assert act.start_calls == 1
+        assert act.end_calls == 1
 
     # simple visit call makes it works fine for the hook start and end
-    assert after_1.visit.call_count == 1
-    assert after_2.visit.call_count == 1
-    assert before_1.visit.call_count == 1
-    assert before_2.visit.call_count == 1
+    for sequential in [before_1, before_2, after_1, after_2]:
+        assert sequential.visit_calls == 1
+        assert sequential.start_calls == 1
+        assert sequential.end_calls == 1
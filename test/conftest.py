@@ -21,28 +21,32 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import itertools
 import pytest
-import uuid
 
-from typing import List, Any
+from typing import List, Any, Callable, Tuple, FrozenSet
 
 from freexgraph import FreExGraph, FreExNode, AnyVisitor, AbstractVisitor
 from freexgraph.freexgraph import GraphNode
 
 
 class VisitationForTesting(AbstractVisitor):
+    __slots__ = ("visited", "inner_graph_started", "inner_graph_ended", "start", "end")
+
     visited: List[str]
     inner_graph_started: List[str]
     inner_graph_ended: List[str]
 
-    start: bool = False
-    end: bool = False
+    start: bool
+    end: bool
 
-    def __init__(self):
-        super().__init__(with_progress_bar=True)
+    def __init__(self, with_progress_bar: bool = False):
+        super().__init__(with_progress_bar=with_progress_bar)
         self.visited = []
         self.inner_graph_started = []
         self.inner_graph_ended = []
+        self.start = False
+        self.end = False
 
     def testing_visit(self, node: FreExNode):
         self.visited.append(node.id)
@@ -74,7 +78,14 @@ def visitor_test():
     return VisitationForTesting()
 
 
+@pytest.fixture(scope="function")
+def visitor_test_with_bar():
+    return VisitationForTesting(with_progress_bar=True)
+
+
 class NodeForTest(FreExNode):
+    __slots__ = ("metadata",)
+
     def __init__(self, uid: str = None, metadata: Any = None, **kwargs):
         kwargs["uid"] = uid
         super().__init__(**kwargs)
@@ -89,6 +100,19 @@ def node_test_class():
     return NodeForTest
 
 
+_unique_id_counter = itertools.count()
+
+
+def make_unique_id(prefix: str) -> str:
+    """Cheap unique id for tests (no need of uuid randomness), formatted as {prefix}_{counter}"""
+    return f"{prefix}_{next(_unique_id_counter)}"
+
+
+@pytest.fixture(scope="session")
+def unique_id() -> Callable[[str], str]:
+    return make_unique_id
+
+
 @pytest.fixture(scope="function")
 def valid_basic_execution_graph():
     #
@@ -102,20 +126,77 @@ def valid_basic_execution_graph():
     #
 
     execution_graph = FreExGraph()
-    id1 = f"id1_{uuid.uuid4()}"
-    id2 = f"id2_{uuid.uuid4()}"
-    id3 = f"id3_{uuid.uuid4()}"
-    id4 = f"id4_{uuid.uuid4()}"
-    id5 = f"id5_{uuid.uuid4()}"
-
-    execution_graph.add_node(NodeForTest(id1))
-    execution_graph.add_node(NodeForTest(id2, parents={id1}))
-    execution_graph.add_node(NodeForTest(id4, parents={id2}))
-    execution_graph.add_node(NodeForTest(id3, parents={id2, id4}))
-    execution_graph.add_node(NodeForTest(id5, parents={id4, id3}))
+    id1 = make_unique_id("id1")
+    id2 = make_unique_id("id2")
+    id3 = make_unique_id("id3")
+    id4 = make_unique_id("id4")
+    id5 = make_unique_id("id5")
+
+    execution_graph.add_nodes(
+        [
+            NodeForTest(id1),
+            NodeForTest(id2, parents={id1}),
+            NodeForTest(id4, parents={id2}),
+            NodeForTest(id3, parents={id2, id4}),
+            NodeForTest(id5, parents={id4, id3}),
+        ]
+    )
+    yield execution_graph
+
+
+@pytest.fixture(scope="session")
+def valid_tiny_graph():
+    # n1 -> n2, enough to check ordering between visitors, must not be modified by the tests
+    execution_graph = FreExGraph()
+    execution_graph.add_nodes([NodeForTest("n1"), NodeForTest("n2", parents={"n1"})])
+    return execution_graph
+
+
+@pytest.fixture(scope="function")
+def diamond_graph():
+    #
+    #                ida
+    #                 |
+    #                idb
+    #              /  |
+    #          idd    |
+    #        /  |  \  |
+    #      idc  |    idx
+    #           |  /
+    #          ide
+    #
+    execution_graph = FreExGraph()
+    execution_graph.add_nodes(
+        [
+            NodeForTest("ida"),
+            NodeForTest("idb", parents={"ida"}),
+            NodeForTest("idd", parents={"idb"}),
+            NodeForTest("idx", parents={"idb", "idd"}),
+            NodeForTest("idc", parents={"idd"}),
+            NodeForTest("ide", parents={"idd", "idx"}),
+        ]
+    )
     yield execution_graph
 
 
+# (id, parents) of the complex graph nodes, voluntarily unordered. parents are frozenset so that nodes share them
+_complex_graph_layout: Tuple[Tuple[str, FrozenSet[str]], ...] = (
+    ("C", frozenset({"A"})),
+    ("K", frozenset({"G", "F"})),
+    ("M", frozenset({"K", "B"})),
+    ("D", frozenset({"A"})),
+    ("J", frozenset({"F"})),
+    ("A", frozenset()),
+    ("E", frozenset({"B"})),
+    ("L", frozenset({"J", "K"})),
+    ("H", frozenset({"F"})),
+    ("F", frozenset({"D", "E"})),
+    ("G", frozenset({"E"})),
+    ("B", frozenset()),
+    ("I", frozenset({"F"})),
+)
+
+
 def unordered_node_list_for_complex_graph() -> List[NodeForTest]:
     #
     #            A                      B
@@ -128,21 +209,7 @@ def unordered_node_list_for_complex_graph() -> List[NodeForTest]:
     #                     /,_____/   \   |
     #                    L             M
     #
-    return [
-        NodeForTest("C", parents={"A"}),
-        NodeForTest("K", parents={"G", "F"}),
-        NodeForTest("M", parents={"K", "B"}),
-        NodeForTest("D", parents={"A"}),
-        NodeForTest("J", parents={"F"}),
-        NodeForTest("A"),
-        NodeForTest("E", parents={"B"}),
-        NodeForTest("L", parents={"J", "K"}),
-        NodeForTest("H", parents={"F"}),
-        NodeForTest("F", parents={"D", "E"}),
-        NodeForTest("G", parents={"E"}),
-        NodeForTest("B"),
-        NodeForTest("I", parents={"F"}),
-    ]
+    return [NodeForTest(uid, parents=parents) for uid, parents in _complex_graph_layout]
 
 
 @pytest.fixture(scope="function")
@@ -157,8 +224,7 @@ def valid_complex_graph():
     yield execution_graph
 
 
-@pytest.fixture(scope="function")
-def valid_graph_with_subgraphs():
+def make_graph_with_subgraphs() -> FreExGraph:
     #
     #            T0
     #            │
@@ -198,3 +264,14 @@ def valid_graph_with_subgraphs():
     result = FreExGraph()
     result.add_nodes([t0, graph_big])
     return result
+
+
+@pytest.fixture(scope="session")
+def graph_with_subgraphs_builder() -> Callable[[], FreExGraph]:
+    return make_graph_with_subgraphs
+
+
+@pytest.fixture(scope="session")
+def valid_graph_with_subgraphs():
+    # only visited by the tests, must not be modified (use graph_with_subgraphs_builder to get a graph to modify)
+    return make_graph_with_subgraphs()
@@ -24,7 +24,7 @@
 import pytest
 
 from freexgraph import FreExGraph
-from freexgraph.standard_visitor import FindFirstVisitor, FindAllVisitor
+from freexgraph.standard_visitor import FindFirstVisitor, MultiFindVisitor
 
 id0 = f"id0"
 id1 = f"id1"
@@ -53,19 +53,34 @@ def make_fork_graph(node_test_class: type):
     #
 
     execution_graph = FreExGraph()
-    execution_graph.add_node(node_test_class(id0))
-    execution_graph.add_node(node_test_class(id1, parents={id0}))
-    execution_graph.add_node(node_test_class(id2, parents={id1}))
-    execution_graph.add_node(node_test_class(id3, parents={id1}))
-    execution_graph.add_node(node_test_class(id4, parents={id1}))
-    execution_graph.add_node(node_test_class(id5, parents={id3}))
-    execution_graph.add_node(node_test_class(id6, parents={id3}))
-    execution_graph.add_node(node_test_class(id_join, parents={id2, id5, id6, id4}))
-    execution_graph.add_node(node_test_class(id7, parents={id_join}))
-    execution_graph.add_node(node_test_class(id8, parents={id_join}))
+    execution_graph.add_nodes(
+        [
+            node_test_class(id0),
+            node_test_class(id1, parents={id0}),
+            node_test_class(id2, parents={id1}),
+            node_test_class(id3, parents={id1}),
+            node_test_class(id4, parents={id1}),
+            node_test_class(id5, parents={id3}),
+            node_test_class(id6, parents={id3}),
+            node_test_class(id_join, parents={id2, id5, id6, id4}),
+            node_test_class(id7, parents={id_join}),
+            node_test_class(id8, parents={id_join}),
+        ]
+    )
     return execution_graph
 
 
+@pytest.fixture(scope="function")
+def fork_graph(node_test_class):
+    yield make_fork_graph(node_test_class)
+
+
+@pytest.fixture(scope="session")
+def unmodified_fork_graph(node_test_class):
+    # for tests on fork errors only, the graph is checked before being modified by fork_from_node
+    return make_fork_graph(node_test_class)
+
+
 def test_simple_fork(valid_basic_execution_graph, node_test_class, visitor_test):
     #
     #          id1
@@ -91,9 +106,17 @@ def test_simple_fork(valid_basic_execution_graph, node_test_class, visitor_test)
     assert visitor_test.end
     assert len(visitor_test.visited) == 8
 
-    find_all = FindAllVisitor(lambda k: k.id.startswith("id4"))
+    # all forked nodes are retrieved in a single visitation
+    find_all = MultiFindVisitor(
+        {
+            "id3": lambda k: k.id.startswith("id3"),
+            "id4": lambda k: k.id.startswith("id4"),
+            "id5": lambda k: k.id.startswith("id5"),
+        }
+    )
     find_all.visit(valid_basic_execution_graph.root)
-    all_4 = find_all.results
+
+    all_4 = find_all.results["id4"]
     all_4.sort(key=lambda k: k.id)
     assert len(all_4) == 2
     assert "::fork_1" not in all_4[0].id
@@ -104,9 +127,7 @@ def test_simple_fork(valid_basic_execution_graph, node_test_class, visitor_test)
     assert len(fork_4_parents) == 1
     assert fork_4_parents[0].startswith("id2")
 
-    find_all = FindAllVisitor(lambda k: k.id.startswith("id3"))
-    find_all.visit(valid_basic_execution_graph.root)
-    all_3 = find_all.results
+    all_3 = find_all.results["id3"]
     all_3.sort(key=lambda k: k.id)
     assert len(all_3) == 2
     assert "::fork_1" not in all_3[0].id
@@ -120,9 +141,7 @@ def test_simple_fork(valid_basic_execution_graph, node_test_class, visitor_test)
     assert fork_3_parents[1].startswith("id4")
     assert "::fork_1" in fork_3_parents[1]
 
-    find_all = FindAllVisitor(lambda k: k.id.startswith("id5"))
-    find_all.visit(valid_basic_execution_graph.root)
-    all_5 = find_all.results
+    all_5 = find_all.results["id5"]
     all_5.sort(key=lambda k: k.id)
     assert len(all_5) == 2
     assert "::fork_1" not in all_5[0].id
@@ -131,41 +150,33 @@ def test_simple_fork(valid_basic_execution_graph, node_test_class, visitor_test)
     assert all_5[1].fork_id == "fork_1"
 
 
-def test_fork_with_join(node_test_class, visitor_test):
-
-    execution_graph = make_fork_graph(node_test_class)
+def test_fork_with_join(fork_graph, node_test_class, visitor_test):
 
-    visitor_test.visit(execution_graph.root)
-    assert len(visitor_test.visited) == 10
+    # 10 nodes + the root node
+    assert len(fork_graph.graph) == 11
 
-    execution_graph.fork_from_node(
-        node_test_class(id1, fork_id="chocobo"), join_id=id_join
-    )
-    visitor_test.visit(execution_graph.root)
+    fork_graph.fork_from_node(node_test_class(id1, fork_id="chocobo"), join_id=id_join)
+    visitor_test.visit(fork_graph.root)
     assert len(visitor_test.visited) == 16
 
 
-def test_fork_with_join_unlinked_with_join(node_test_class, visitor_test):
+def test_fork_with_join_unlinked_with_join(fork_graph, node_test_class, visitor_test):
 
     id_9 = "id_9"
 
-    execution_graph = make_fork_graph(node_test_class)
-
     # id 9 making a jump from in the fork (id6 being in the fork) to outside (id8 being after the join_node)
-    execution_graph.add_node(node_test_class(id_9, parents={id6, id8}))
+    fork_graph.add_node(node_test_class(id_9, parents={id6, id8}))
 
-    visitor_test.visit(execution_graph.root)
-    assert len(visitor_test.visited) == 11
+    # 11 nodes + the root node
+    assert len(fork_graph.graph) == 12
 
-    execution_graph.fork_from_node(
-        node_test_class(id1, fork_id="chocobo"), join_id=id_join
-    )
+    fork_graph.fork_from_node(node_test_class(id1, fork_id="chocobo"), join_id=id_join)
 
-    visitor_test.visit(execution_graph.root)
+    visitor_test.visit(fork_graph.root)
     assert len(visitor_test.visited) == 18
 
     find = FindFirstVisitor(lambda k: k.id.startswith(f"{id_9}::chocobo"))
-    find.visit(execution_graph.root)
+    find.visit(fork_graph.root)
     assert find.result is not None
     assert len(find.result.parents) == 2
     check_result = sorted(find.result.parents)
@@ -173,64 +184,50 @@ def test_fork_with_join_unlinked_with_join(node_test_class, visitor_test):
     assert check_result[1].startswith("id8")
 
 
-def test_fork_with_join_unlinked_with_join_2(node_test_class, visitor_test):
+def test_fork_with_join_unlinked_with_join_2(fork_graph, node_test_class, visitor_test):
 
     id_9 = "id_9"
 
-    execution_graph = make_fork_graph(node_test_class)
-
     # id 9 not linked with join_node
-    execution_graph.add_node(node_test_class(id_9, parents={id6}))
+    fork_graph.add_node(node_test_class(id_9, parents={id6}))
 
-    visitor_test.visit(execution_graph.root)
-    assert len(visitor_test.visited) == 11
+    # 11 nodes + the root node
+    assert len(fork_graph.graph) == 12
 
-    execution_graph.fork_from_node(
-        node_test_class(id1, fork_id="chocobo"), join_id=id_join
-    )
+    fork_graph.fork_from_node(node_test_class(id1, fork_id="chocobo"), join_id=id_join)
 
-    visitor_test.visit(execution_graph.root)
+    visitor_test.visit(fork_graph.root)
     assert len(visitor_test.visited) == 18
 
 
-def test_fork_without_fork_id(node_test_class, visitor_test):
-    execution_graph = make_fork_graph(node_test_class)
-    visitor_test.visit(execution_graph.root)
-
-    with pytest.raises(AssertionError) as e:
-        execution_graph.fork_from_node(
+def test_fork_without_fork_id(unmodified_fork_graph, node_test_class):
+    with pytest.raises(
+        AssertionError, match=f"Error fork of node {id1}: doesn't have fork_id"
+    ):
+        unmodified_fork_graph.fork_from_node(
             node_test_class(id1, fork_id=None), join_id=id_join
         )
-        assert f"Error fork of node {id1}: doesn't have fork_id" == e
-
 
-def test_fork_with_inexistant_join_id(node_test_class, visitor_test):
-    execution_graph = make_fork_graph(node_test_class)
-    visitor_test.visit(execution_graph.root)
 
+def test_fork_with_inexistant_join_id(unmodified_fork_graph, node_test_class):
     join_not_exist = "ThisDoesntExistAtAll"
 
-    with pytest.raises(AssertionError) as e:
-        execution_graph.fork_from_node(
+    with pytest.raises(
+        AssertionError,
+        match=f"Error fork of node {id1} with join_id {join_not_exist}: join_id node doesn't exist in graph",
+    ):
+        unmodified_fork_graph.fork_from_node(
             node_test_class(id1, fork_id="chocobo"), join_id=join_not_exist
         )
-        assert (
-            f"Error fork of node {id1} with join_id {join_not_exist}: join_id node doesn't exist in graph "
-            == e
-        )
 
 
-def test_fork_with_inexistant_node(node_test_class, visitor_test):
-    execution_graph = make_fork_graph(node_test_class)
-    visitor_test.visit(execution_graph.root)
-
+def test_fork_with_inexistant_node(unmodified_fork_graph, node_test_class):
     id_not_exist = "ThisDoesntExistAtAll"
 
-    with pytest.raises(AssertionError) as e:
-        execution_graph.fork_from_node(
+    with pytest.raises(
+        AssertionError,
+        match=f"Error fork of node {id_not_exist}, node to fork has to be in the execution graph",
+    ):
+        unmodified_fork_graph.fork_from_node(
             node_test_class(id_not_exist, fork_id="chocobo"), join_id=id_join
         )
-        assert (
-            f"Error fork of node {id_not_exist}, node to fork has to be in the execution graph"
-            == e
-        )
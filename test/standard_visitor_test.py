@@ -26,6 +26,7 @@ from freexgraph.standard_visitor import (
     ValidateGraphIntegrity,
     FindFirstVisitor,
     FindAllVisitor,
+    MultiFindVisitor,
     StandardVisitor,
     LenCalculatorVisitor,
 )
@@ -49,6 +50,19 @@ def test_find_visitor(valid_basic_execution_graph):
     assert len(v.result.parents) == 2
 
 
+def test_find_visitor_stop_on_first_match(valid_basic_execution_graph):
+    v = FindFirstVisitor(lambda node: node.id.startswith("id3"))
+    visited = []
+    v.register_custom_hook(
+        predicate=lambda _: True, hook=lambda n: visited.append(n.id)
+    )
+
+    # visitation is interrupted once found, id5 (after id3) is never reached
+    assert not v.visit(valid_basic_execution_graph.root)
+    assert v.found()
+    assert [n.split("_", 1)[0] for n in visited] == ["id1", "id2", "id4", "id3"]
+
+
 def test_find_reverse_visitor(node_test_class):
     v = FindFirstVisitor(lambda node: node.id.startswith("id3"))
     v.is_reversed = True
@@ -94,6 +108,37 @@ def test_count_visitor(valid_basic_execution_graph):
     assert v.results[1].id.startswith("id5")
 
 
+def test_multi_find_visitor(valid_basic_execution_graph):
+    v = MultiFindVisitor(
+        {
+            "id3": lambda node: node.id.startswith("id3"),
+            "after_id3": lambda node: node.id[0:3] > "id3",
+            "none": lambda node: node.id == "NOT_EXISTING",
+        }
+    )
+    v.visit(valid_basic_execution_graph.root)
+    assert v.count("id3") == 1
+    assert v.results["id3"][0].id.startswith("id3")
+    assert v.count("after_id3") == 2
+    assert v.results["after_id3"][0].id.startswith("id4")
+    assert v.results["after_id3"][1].id.startswith("id5")
+    assert v.count("none") == 0
+    # test re-use
+    v.visit(valid_basic_execution_graph.root)
+    assert v.count("id3") == 1
+    assert v.count("after_id3") == 2
+
+
+def test_multi_find_visitor_depth_limit(valid_graph_with_subgraphs):
+    v = MultiFindVisitor(
+        {"T2": lambda node: node.id[0:2] == "T2", "T0": lambda node: node.id == "T0"},
+        extension_depth_limit=1,
+    )
+    v.visit(valid_graph_with_subgraphs.root)
+    assert v.count("T2") == 1
+    assert v.count("T0") == 1
+
+
 def test_find_all_visitor_depth_limit_0(valid_graph_with_subgraphs):
     v = FindAllVisitor(lambda node: node.id[0:2] == "T2", extension_depth_limit=0)
     v.visit(valid_graph_with_subgraphs.root)
@@ -129,3 +174,26 @@ def test_standard_len_calculator(valid_graph_with_subgraphs):
     v = LenCalculatorVisitor()
     v.visit(valid_graph_with_subgraphs.root)
     assert v.result == 9
+
+
+def test_find_visitor_stop_in_graph_node(graph_with_subgraphs_builder, node_test_class):
+    graph_with_subgraphs = graph_with_subgraphs_builder()
+    graph_with_subgraphs.add_node(node_test_class("T9", parents={"graph_big"}))
+
+    # T2 is found inside graph_big, visitation has to stop there instead of continuing to T9
+    v = FindFirstVisitor(lambda node: node.id in ["T2", "T9"])
+    assert not v.visit(graph_with_subgraphs.root)
+    assert v.found()
+    assert v.result.id == "T2"
+
+
+def test_standard_visitors_without_dict():
+    visitors = [
+        FindFirstVisitor(lambda node: True),
+        FindAllVisitor(lambda node: True),
+        MultiFindVisitor({"all": lambda node: True}),
+        LenCalculatorVisitor(),
+        ValidateGraphIntegrity(),
+    ]
+    for v in visitors:
+        assert not hasattr(v, "__dict__"), type(v).__name__
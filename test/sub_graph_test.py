@@ -24,6 +24,7 @@
 import pytest
 
 from freexgraph import FreExGraph
+from freexgraph.freexgraph import root_node
 
 # Graph used in theses tests are from valid_complex_graph fixture
 #
@@ -40,6 +41,14 @@ from freexgraph import FreExGraph
 #
 
 
+def assert_in_execution_order(visited, graph: FreExGraph):
+    """visitation is done in a topological order: each node is visited after all its parents"""
+    position = {node_id: i for i, node_id in enumerate(visited)}
+    for node_id, i in position.items():
+        for parent in graph.get_node(node_id).parents:
+            assert parent == root_node or position[parent] < i
+
+
 def test_sub_graph_without_to_node(valid_complex_graph, visitor_test):
     # From F to end
     #
@@ -52,6 +61,7 @@ def test_sub_graph_without_to_node(valid_complex_graph, visitor_test):
     sub_graph: FreExGraph = valid_complex_graph.sub_graph(from_node_id="F")
 
     visitor_test.visit(sub_graph.root)
+    assert_in_execution_order(visitor_test.visited, sub_graph)
 
     assert len(visitor_test.visited) == 7
     sorted_visit = sorted(visitor_test.visited)
@@ -92,6 +102,7 @@ def test_sub_graph_with_to_node(valid_complex_graph, visitor_test):
     )
 
     visitor_test.visit(sub_graph.root)
+    assert_in_execution_order(visitor_test.visited, sub_graph)
 
     assert len(visitor_test.visited) == 8
     sorted_visit = sorted(visitor_test.visited)
@@ -120,6 +131,7 @@ def test_sub_graph_with_to_node_not_found(valid_complex_graph, visitor_test):
     )
 
     visitor_test.visit(sub_graph.root)
+    assert_in_execution_order(visitor_test.visited, sub_graph)
 
     assert len(visitor_test.visited) == 7
     sorted_visit = sorted(visitor_test.visited)
@@ -133,28 +145,93 @@ def test_sub_graph_with_to_node_not_found(valid_complex_graph, visitor_test):
     assert sorted_visit[6] == "M"
 
 
+def test_sub_graph_with_single_to_node(valid_complex_graph, visitor_test):
+    # From F to K, M is only reachable through K
+    sub_graph: FreExGraph = valid_complex_graph.sub_graph(
+        from_node_id="F", to_nodes_id="K"
+    )
+
+    visitor_test.visit(sub_graph.root)
+    assert_in_execution_order(visitor_test.visited, sub_graph)
+
+    assert sorted(visitor_test.visited) == ["F", "H", "I", "J", "K", "L"]
+
+
 def test_sub_graph_error_on_from_node(valid_complex_graph):
-    with pytest.raises(AssertionError) as e:
+    with pytest.raises(
+        AssertionError,
+        match="Error sub graph from node NOT_EXISTING, node has to be in the execution graph",
+    ):
         valid_complex_graph.sub_graph(from_node_id="NOT_EXISTING")
-        assert (
-            "Error sub graph from node NOT_EXISTING, node has to be in the execution graph"
-            == e
-        )
 
 
 def test_sub_graph_error_on_to_node(valid_complex_graph):
-    with pytest.raises(AssertionError) as e:
+    with pytest.raises(
+        AssertionError,
+        match="Error sub graph to node NOT_EXIST, node has to be in the execution graph",
+    ):
         valid_complex_graph.sub_graph(from_node_id="F", to_nodes_id=["NOT_EXIST"])
-        assert (
-            "Error sub graph to node NOT_EXIST, node has to be in the execution graph"
-            == e
-        )
 
-    with pytest.raises(AssertionError) as e:
+    with pytest.raises(
+        AssertionError,
+        match="Error sub graph to node NOT_EXISTING, node has to be in the execution graph",
+    ):
         valid_complex_graph.sub_graph(
             from_node_id="F", to_nodes_id=["H", "M", "NOT_EXISTING"]
         )
-        assert (
-            "Error sub graph to node NOT_EXISTING, node has to be in the execution graph"
-            == e
-        )
+
+    # to nodes are checked even if the traversal would never reach them
+    with pytest.raises(AssertionError, match="Error sub graph to node NOT_EXISTING"):
+        valid_complex_graph.sub_graph(from_node_id="H", to_nodes_id=["NOT_EXISTING"])
+
+
+def test_sub_graph_nodes_are_copies(valid_complex_graph):
+    sub_graph: FreExGraph = valid_complex_graph.sub_graph(from_node_id="F")
+
+    sub_f = sub_graph.get_node("F")
+    assert sub_f is not valid_complex_graph.get_node("F")
+    assert sub_f.graph_ref is sub_graph.graph
+    assert valid_complex_graph.get_node("F").graph_ref is valid_complex_graph.graph
+
+    sub_f.metadata = "modified"
+    assert valid_complex_graph.get_node("F").metadata is None
+
+
+def test_iter_sub_graph(valid_complex_graph):
+    nodes = list(valid_complex_graph.iter_sub_graph("F", to_nodes_id=["K", "J"]))
+
+    # nodes of the graph itself are yielded, parents are untouched
+    assert sorted(n.id for n in nodes) == ["F", "H", "I", "J", "K"]
+    assert all(n is valid_complex_graph.get_node(n.id) for n in nodes)
+    assert valid_complex_graph.get_node("F").parents == {"D", "E"}
+
+    # same nodes as the built sub graph (which also has a root node)
+    sub_graph: FreExGraph = valid_complex_graph.sub_graph("F", to_nodes_id=["K", "J"])
+    assert len(sub_graph.graph) == len(nodes) + 1
+
+
+def test_iter_sub_graph_error_on_call(valid_complex_graph):
+    # errors are raised when calling iter_sub_graph, not when iterating over it
+    with pytest.raises(AssertionError, match="from node NOT_EXISTING"):
+        valid_complex_graph.iter_sub_graph(from_node_id="NOT_EXISTING")
+    with pytest.raises(AssertionError, match="to node NOT_EXISTING"):
+        valid_complex_graph.iter_sub_graph(from_node_id="F", to_nodes_id="NOT_EXISTING")
+
+
+def test_sub_graph_of_long_chain(node_test_class):
+    # longer than the default recursion limit
+    chain_len = 2000
+    execution_graph = FreExGraph()
+    execution_graph.add_nodes(
+        [node_test_class("n_0")]
+        + [
+            node_test_class(f"n_{i}", parents={f"n_{i - 1}"})
+            for i in range(1, chain_len)
+        ]
+    )
+
+    sub_graph: FreExGraph = execution_graph.sub_graph(
+        from_node_id="n_1000", to_nodes_id="n_1499"
+    )
+    assert len(sub_graph.graph) == 500 + 1  # with root node
+    assert sub_graph.get_node("n_1000").parents == {root_node}